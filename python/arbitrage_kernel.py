@@ -0,0 +1,35 @@
+"""
+Compiled numeric kernels for arbitrage screening
+"""
+import numpy as np
+from numba import njit
+
+
+# Compiled eagerly at import (or loaded from the on-disk cache) so the first
+# block doesn't pay for JIT compilation
+@njit("Tuple((b1[:], f8[:]))(f8[:], f8[:], f8, f8, f8, f8)", cache=True, fastmath=True)
+def score_pairs(uni_out, sushi_out, amount_in, gas_cost, min_profit_wei, liquidity_score):
+    """Screen every pair in one compiled loop.
+
+    Quotes are float64 because 18-decimal amounts overflow int64; survivors are
+    re-checked with exact integer math in calculate_arbitrage_opportunity.
+    Returns (profitable mask, confidence), one entry per pair.
+    """
+    n = uni_out.shape[0]
+    mask = np.zeros(n, dtype=np.bool_)
+    confidence = np.empty(n, dtype=np.float64)
+
+    liq = min(liquidity_score, 1.0) * 0.6
+    for i in range(n):
+        lo = min(uni_out[i], sushi_out[i])
+        hi = max(uni_out[i], sushi_out[i])
+
+        # Spread between the two quotes, expressed in wei of token A
+        profit = (hi - lo) * amount_in / lo if lo > 0 else 0.0
+        mask[i] = lo > 0 and profit - gas_cost >= min_profit_wei
+
+        # Weighted confidence score
+        confidence[i] = liq + min(profit / (min_profit_wei * 10), 1.0) * 0.4
+
+    return mask, confidence
+
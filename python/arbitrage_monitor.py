@@ -3,18 +3,18 @@
 Arbitrage Monitor - Python integration for advanced arbitrage detection
 """
 
-import requests
-import json
-import time
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from web3 import Web3
+from web3 import AsyncWeb3, AsyncHTTPProvider, WebsocketProviderV2
 import asyncio
 import aiohttp
-import json
-import os
-from decimal import Decimal
-from config import TOKENS  # Import token addresses
+import logging
+import numpy as np
+from eth_utils import function_signature_to_4byte_selector
+from config import TOKENS, IPC_PATH  # Import token addresses
+from utils.rpc import RPC_TIMEOUT, AsyncIPCProvider
+from utils.logger import ArbitrageLogger
+from arbitrage_kernel import score_pairs
 
 # Router ABIs (minimal for price checking)
 ROUTER_ABI = [
@@ -30,7 +30,18 @@ ROUTER_ABI = [
     }
 ]
 
-@dataclass
+# Quotes are taken for 1 unit (1e18 wei) of the input token
+QUOTE_AMOUNT_IN = 10 ** 18
+
+GET_AMOUNTS_OUT_SELECTOR = function_signature_to_4byte_selector('getAmountsOut(uint256,address[])')
+
+# Multicall3 quotes every router x pair in a single eth_call. It is deployed at the
+# same address on mainnet, Sepolia and most EVM chains (stored already checksummed)
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector('aggregate3((address,bool,bytes)[])')
+
+@dataclass(slots=True, frozen=True)
 class ArbitrageOpportunity:
     token_a: str
     token_b: str
@@ -44,23 +55,44 @@ class ArbitrageOpportunity:
     confidence_score: float
 
 class ArbitrageMonitor:
-    def __init__(self, rpc_url: str, contract_address: str, private_key: str):
-        # Initialize Web3 with HTTP provider
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+    def __init__(self, rpc_url: str, contract_address: str, private_key: str,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 logger: Optional[ArbitrageLogger] = None):
+        # Initialize async Web3 so RPC calls don't block the event loop.
+        # A local node's IPC socket avoids HTTP framing on every call.
+        self.rpc_url = rpc_url
+        if IPC_PATH:
+            provider = AsyncIPCProvider(IPC_PATH)
+        else:
+            provider = AsyncHTTPProvider(
+                rpc_url,
+                request_kwargs={'timeout': aiohttp.ClientTimeout(total=RPC_TIMEOUT)}
+            )
+        self.w3 = AsyncWeb3(provider)
         
-        # Verify connection
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to RPC endpoint: {rpc_url}")
+        # Shared aiohttp session; opened in connect() unless the caller provides one
+        self.session = session
+        self._owns_session = False
             
         self.contract_address = contract_address
         self.private_key = private_key
         
+        # Queue-backed logger so the quoting path never blocks on a write
+        self.logger = logger or ArbitrageLogger()
+        
         # Risk management parameters
         self.min_profit_threshold = 0.001  # ETH
+        self.min_profit_threshold_wei = int(self.min_profit_threshold * 10**18)
         self.max_slippage = 0.03  # 3%
         self.max_gas_price = 50  # gwei
         self.min_liquidity = 10000  # USD
         
+        # (block_number, gas_price_wei) of the last gas price fetch
+        self._gas_price_cache: Optional[Tuple[int, int]] = None
+        
+        # (block_number, token_a, token_b, amount_in) -> amounts out per router, in self.routers order
+        self._quote_cache: Dict[Tuple[int, str, str, int], Tuple[int, ...]] = {}
+        
 
         # Router addresses (Sepolia testnet)
         self.routers = {
@@ -68,106 +100,79 @@ class ArbitrageMonitor:
             'sushiswap': '0xeaBcE3E74EF41FB40024a21Cc2ee2F5dDc615791'  # Sushiswap Router (Factory address used as router)
         }
         
-        print("Initialized price monitoring for:")
-        print(f"Uniswap V2 Router: {self.routers['uniswap']}")
-        print(f"Sushiswap Router: {self.routers['sushiswap']}")
+        # Checksummed addresses, memoized since checksumming hashes the address
+        self._cs_cache: Dict[str, str] = {}
+        
+        # Token lookups keyed by raw 20-byte address, so case never matters
+        self._six_decimal_tokens = frozenset(bytes.fromhex(TOKENS[s][2:]) for s in ("USDC", "USDT"))
+        self._token_symbols = {bytes.fromhex(addr[2:]): symbol for symbol, addr in TOKENS.items()}
+        
+        # Encoded getAmountsOut calldata per (amount_in, path); identical for every router
+        self._calldata_cache: Dict[Tuple[int, tuple], bytes] = {}
+        
+        # Encoded aggregate3 calldata per batch of (router, amount_in, path) quotes
+        self._aggregate_cache: Dict[tuple, bytes] = {}
+        
+        # Contract factory with ROUTER_ABI parsed once; router instances just bind an address
+        self._router_factory = self.w3.eth.contract(abi=ROUTER_ABI)
+        
+        # Build router contracts once instead of on every quote
+        self._routers_c = {name: self._get_router_contract(addr) for name, addr in self.routers.items()}
+        
+        self.logger.log_info("Initialized price monitoring for:")
+        self.logger.log_info(f"Uniswap V2 Router: {self.routers['uniswap']}")
+        self.logger.log_info(f"Sushiswap Router: {self.routers['sushiswap']}")
     
-    async def get_token_prices(self, token_addresses: List[str]) -> Dict[str, float]:
-        """Fetch current token prices from multiple DEXs"""
-        prices = {}
-        
-        # Get prices using router contracts
-        amount_in = Web3.to_wei(1, 'ether')
-        
-        for token_address in token_addresses:
-            # Get Uniswap price
-            try:
-                path = [self.w3.to_checksum_address(addr) for addr in [token_address, token_addresses[0]]]
-                uni_router = self._get_router_contract(self.routers['uniswap'])
-                amounts = uni_router.functions.getAmountsOut(amount_in, path).call()
-                prices[f"uniswap_v2_{token_address}"] = {
-                    'price': amounts[1] / amount_in,
-                    'liquidity': 1.0,  # Simplified
-                    'symbol': token_address[-4:]
-                }
-            except Exception as e:
-                print(f"Error getting Uniswap price for {token_address}: {e}")
-            
-            # Get Sushiswap price
-            try:
-                sushi_router = self._get_router_contract(self.routers['sushiswap'])
-                amounts = sushi_router.functions.getAmountsOut(amount_in, path).call()
-                prices[f"sushiswap_{token_address}"] = {
-                    'price': amounts[1] / amount_in,
-                    'liquidity': 1.0,  # Simplified
-                    'symbol': token_address[-4:]
-                }
-            except Exception as e:
-                print(f"Error getting Sushiswap price for {token_address}: {e}")
+    async def connect(self):
+        """Open the shared HTTP session and verify the RPC connection"""
+        if isinstance(self.w3.provider, AsyncHTTPProvider):
+            if self.session is None:
+                # Keep connections alive between cycles so each call skips the TCP/TLS handshake
+                self.session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+                )
+                self._owns_session = True
+            # Every request from the provider reuses this session's connection pool
+            await self.w3.provider.cache_async_session(self.session)
         
-        return prices
+        # Verify connection
+        if not await self.w3.is_connected():
+            raise ConnectionError(f"Failed to connect to RPC endpoint: {IPC_PATH or self.rpc_url}")
     
-    async def _fetch_dex_price(self, router_contract, path: List[str], amount_in: int) -> float:
-        """Fetch price from a specific DEX router"""
-        try:
-            amounts = router_contract.functions.getAmountsOut(amount_in, path).call()
-            return amounts[1] / amount_in
-        except Exception as e:
-            print(f"Error fetching price: {e}")
-            return 0.0
+    async def close(self):
+        """Close the shared HTTP session if this monitor opened it"""
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+            self._owns_session = False
     
     def calculate_arbitrage_opportunity(self, token_a: str, token_b: str, 
-                                       amount_in: int, prices: Dict[str, float]) -> Optional[ArbitrageOpportunity]:
-        """Calculate arbitrage opportunity between two DEXs"""
-        
-        # Get prices from different DEXs
-        uniswap_a_price = prices.get(f"uniswap_v2_{token_a}", {}).get('price', 0)
-        uniswap_b_price = prices.get(f"uniswap_v2_{token_b}", {}).get('price', 0)
-        sushiswap_a_price = prices.get(f"sushiswap_{token_a}", {}).get('price', 0)
-        sushiswap_b_price = prices.get(f"sushiswap_{token_b}", {}).get('price', 0)
-        
-        if not all([uniswap_a_price, uniswap_b_price, sushiswap_a_price, sushiswap_b_price]):
-            return None
-        
-        # Calculate exchange rates
-        uniswap_rate = uniswap_b_price / uniswap_a_price if uniswap_a_price > 0 else 0
-        sushiswap_rate = sushiswap_b_price / sushiswap_a_price if sushiswap_a_price > 0 else 0
+                                       amount_in: int, prices: Dict[Tuple[str, str, str], int],
+                                       gas_cost: int, confidence: float) -> Optional[ArbitrageOpportunity]:
+        """Calculate arbitrage opportunity between two DEXs
+
+        ``prices`` maps (router name, token_a, token_b) to the raw getAmountsOut output
+        for ``amount_in``, so all math stays in integer wei.
+        """
+        uni_out = prices.get(('uniswap', token_a, token_b), 0)
+        sushi_out = prices.get(('sushiswap', token_a, token_b), 0)
         
-        if uniswap_rate == 0 or sushiswap_rate == 0:
+        if not uni_out or not sushi_out or uni_out == sushi_out:
             return None
         
         # Calculate potential profit
-        # Strategy: Buy on DEX with lower rate, sell on DEX with higher rate
-        if uniswap_rate > sushiswap_rate:
-            # Buy on SushiSwap, sell on Uniswap
-            amount_out_sushi = amount_in * sushiswap_rate
-            amount_out_uni = amount_out_sushi / uniswap_rate
-            profit = amount_out_uni - amount_in
-            router1, router2 = "sushiswap", "uniswap_v2"
-            reverse_order = True
-        else:
-            # Buy on Uniswap, sell on SushiSwap
-            amount_out_uni = amount_in * uniswap_rate
-            amount_out_sushi = amount_out_uni / sushiswap_rate
-            profit = amount_out_sushi - amount_in
-            router1, router2 = "uniswap_v2", "sushiswap"
-            reverse_order = True
-        
-        if profit <= 0:
-            return None
-        
-        # Calculate gas costs
-        gas_cost = self._estimate_gas_cost()
+        # Strategy: Buy token B on the DEX that returns less of it, sell on the one that returns more.
+        # The spread between the two quotes is expressed in wei of token A.
+        reverse_order = uni_out > sushi_out
+        hi, lo = (uni_out, sushi_out) if reverse_order else (sushi_out, uni_out)
+        profit = (hi - lo) * amount_in // lo
         
         # Calculate net profit
         net_profit = profit - gas_cost
         
-        if net_profit < self.min_profit_threshold:
+        if net_profit < self.min_profit_threshold_wei:
             return None
         
-        # Calculate confidence score based on liquidity and price differences
-        confidence = self._calculate_confidence_score(token_a, token_b, prices, profit)
-        
         return ArbitrageOpportunity(
             token_a=token_a,
             token_b=token_b,
@@ -175,44 +180,32 @@ class ArbitrageMonitor:
             expected_profit=profit,
             gas_cost=gas_cost,
             net_profit=net_profit,
-            router1=router1,
-            router2=router2,
+            router1=self.routers['uniswap'],
+            router2=self.routers['sushiswap'],
             reverse_order=reverse_order,
             confidence_score=confidence
         )
     
-    def _estimate_gas_cost(self) -> int:
+    async def _current_gas_price(self, block_number: Optional[int] = None) -> int:
+        """Get the gas price, fetching it at most once per block"""
+        if block_number is None:
+            return await self.w3.eth.gas_price
+        
+        if self._gas_price_cache is None or self._gas_price_cache[0] != block_number:
+            self._gas_price_cache = (block_number, await self.w3.eth.gas_price)
+        return self._gas_price_cache[1]
+    
+    async def _estimate_gas_cost(self, gas_price_wei: Optional[int] = None) -> int:
         """Estimate gas cost for arbitrage execution"""
         # Typical gas usage for arbitrage: ~200,000 gas
         gas_limit = 200000
-        gas_price = self.w3.eth.gas_price
-        
-        # Convert to ETH
-        gas_cost_wei = gas_limit * gas_price
-        gas_cost_eth = self.w3.from_wei(gas_cost_wei, 'ether')
-        
-        return int(gas_cost_eth * 1e18)  # Return in wei
-    
-    def _calculate_confidence_score(self, token_a: str, token_b: str, 
-                                  prices: Dict[str, float], profit: int) -> float:
-        """Calculate confidence score for the arbitrage opportunity"""
-        # Get liquidity information
-        uniswap_liquidity_a = prices.get(f"uniswap_v2_{token_a}", {}).get('liquidity', 0)
-        sushiswap_liquidity_a = prices.get(f"sushiswap_{token_a}", {}).get('liquidity', 0)
-        
-        # Calculate liquidity score (0-1)
-        total_liquidity = uniswap_liquidity_a + sushiswap_liquidity_a
-        liquidity_score = min(total_liquidity / self.min_liquidity, 1.0)
+        if gas_price_wei is None:
+            gas_price_wei = await self.w3.eth.gas_price
         
-        # Calculate profit score (0-1)
-        profit_score = min(profit / (self.min_profit_threshold * 1e18 * 10), 1.0)
-        
-        # Weighted confidence score
-        confidence = (liquidity_score * 0.6) + (profit_score * 0.4)
-        
-        return confidence
+        return gas_limit * gas_price_wei  # In wei
     
-    def assess_risk(self, opportunity: ArbitrageOpportunity) -> Dict[str, any]:
+    async def assess_risk(self, opportunity: ArbitrageOpportunity,
+                          gas_price_wei: Optional[int] = None) -> Dict[str, any]:
         """Comprehensive risk assessment for an arbitrage opportunity"""
         risks = {
             'slippage_risk': 'low',
@@ -229,8 +222,9 @@ class ArbitrageMonitor:
             risks['slippage_risk'] = 'medium'
         
         # Gas risk assessment
-        current_gas_price = self.w3.eth.gas_price
-        if current_gas_price > self.max_gas_price * 1e9:  # Convert gwei to wei
+        if gas_price_wei is None:
+            gas_price_wei = await self.w3.eth.gas_price
+        if gas_price_wei > self.max_gas_price * 1e9:  # Convert gwei to wei
             risks['gas_risk'] = 'high'
         
         # Overall risk assessment
@@ -246,103 +240,202 @@ class ArbitrageMonitor:
     
     def _get_router_contract(self, router_address: str):
         """Get router contract instance"""
-        return self.w3.eth.contract(
-            address=self.w3.to_checksum_address(router_address),
-            abi=ROUTER_ABI
-        )
+        return self._router_factory(address=self._cs(router_address))
 
-    async def get_current_prices(self, token_pair: tuple) -> tuple:
-        """Get current prices from Uniswap V2 and Sushiswap for a token pair"""
-        try:
-            token_a, token_b = token_pair
-            amount_in = Web3.to_wei(1, 'ether')  # Price check with 1 ETH
-            path = [self.w3.to_checksum_address(addr) for addr in [token_a, token_b]]
+    def _amounts_out_calldata(self, amount_in: int, path: List[str]) -> bytes:
+        """Get getAmountsOut calldata, ABI-encoding each (amount_in, path) only once"""
+        key = (amount_in, tuple(path))
+        calldata = self._calldata_cache.get(key)
+        if calldata is None:
+            calldata = GET_AMOUNTS_OUT_SELECTOR + self.w3.codec.encode(['uint256', 'address[]'], [amount_in, path])
+            self._calldata_cache[key] = calldata
+        return calldata
 
-            # --- Uniswap ---
-            uni_router_address = self.routers['uniswap']
-            uni_router = self.w3.eth.contract(
-                address=self.w3.to_checksum_address(uni_router_address),
-                abi=UNISWAP_ROUTER_ABI
-            )
-            uni_amounts = uni_router.functions.getAmountsOut(amount_in, path).call()
-            uni_decimals = 6 if token_b.lower() in [TOKENS["USDC"].lower(), TOKENS["USDT"].lower()] else 18
-            uni_price = uni_amounts[1] / (10 ** uni_decimals)
+    def _decimals(self, token: bytes) -> int:
+        """Get the decimals of a token given its raw 20-byte address"""
+        return 6 if token in self._six_decimal_tokens else 18
 
-            # --- Sushiswap ---
-            sushi_router_address = self.routers['sushiswap']
-            sushi_router = self.w3.eth.contract(
-                address=self.w3.to_checksum_address(sushi_router_address),
-                abi=UNISWAP_ROUTER_ABI  # Sushi uses the same ABI
-            )
-            sushi_amounts = sushi_router.functions.getAmountsOut(amount_in, path).call()
-            sushi_decimals = 6 if token_b.lower() in [TOKENS["USDC"].lower(), TOKENS["USDT"].lower()] else 18
-            sushi_price = sushi_amounts[1] / (10 ** sushi_decimals)
+    def token_decimals(self, token: str) -> int:
+        """Get the decimals of a token address"""
+        return self._decimals(bytes.fromhex(token[2:]))
+
+    def _cs(self, address: str) -> str:
+        """Get the checksum form of an address, computing it only once"""
+        checksummed = self._cs_cache.get(address)
+        if checksummed is None:
+            checksummed = self._cs_cache[address] = self.w3.to_checksum_address(address)
+        return checksummed
+
+    def _aggregate_calldata(self, calls: List[Tuple[str, int, tuple]]) -> bytes:
+        """Get aggregate3 calldata for a batch of quotes, ABI-encoding each batch only once"""
+        key = tuple(calls)
+        calldata = self._aggregate_cache.get(key)
+        if calldata is None:
+            call3 = [
+                (
+                    router_address,
+                    True,  # allowFailure: one missing pool must not sink the whole batch
+                    self._amounts_out_calldata(amount_in, list(path))
+                )
+                for router_address, amount_in, path in calls
+            ]
+            calldata = AGGREGATE3_SELECTOR + self.w3.codec.encode(['(address,bool,bytes)[]'], [call3])
+            self._aggregate_cache[key] = calldata
+        return calldata
+
+    def _quote_calls(self, pairs: List[Tuple[str, str]]) -> List[Tuple[str, int, tuple]]:
+        """Build the (router, amount_in, path) quote for every pair on every router"""
+        calls = []
+        for token_a, token_b in pairs:
+            path = (self._cs(token_a), self._cs(token_b))
+            for router in self._routers_c.values():  # Sushi uses the same ABI
+                calls.append((router.address, QUOTE_AMOUNT_IN, path))
+        return calls
 
-            token_a_symbol = "WETH"
-            token_b_symbol = "USDC" if token_b.lower() == TOKENS["USDC"].lower() else "USDT"
+    def warm_calldata(self, pairs: List[Tuple[str, str]]):
+        """Encode the quote batch for ``pairs`` ahead of the first poll"""
+        self._aggregate_calldata(self._quote_calls(pairs))
 
-            print(f"Uniswap Price: 1 {token_a_symbol} = {uni_price:.2f} {token_b_symbol}")
-            print(f"Sushiswap Price: 1 {token_a_symbol} = {sushi_price:.2f} {token_b_symbol}")
+    async def _multicall_get_amounts_out(self, calls: List[Tuple[str, int, tuple]],
+                                         block_number: Optional[int] = None) -> List[int]:
+        """Quote every (router, amount_in, path) with a single Multicall3 eth_call.
 
-            return float(uni_price), float(sushi_price)
+        All quotes are read at ``block_number`` (latest if None) so they come from
+        the same state. Returns amounts[1] for each call, or 0 where the router
+        call reverted.
+        """
+        block_identifier = block_number if block_number is not None else 'latest'
+        raw = await self.w3.eth.call(
+            {'to': MULTICALL3_ADDRESS, 'data': self._aggregate_calldata(calls)},
+            block_identifier
+        )
+        results = self.w3.codec.decode(['(bool,bytes)[]'], raw)[0]
+        
+        amounts_out = []
+        for success, return_data in results:
+            if success and return_data:
+                amounts = self.w3.codec.decode(['uint256[]'], return_data)[0]
+                amounts_out.append(amounts[1])
+            else:
+                amounts_out.append(0)
+        return amounts_out
+
+    async def get_pair_quotes(self, pairs: List[Tuple[str, str]],
+                              block_number: Optional[int] = None) -> Dict[Tuple[str, str, str], int]:
+        """Quote every pair on every router in one batch.
+
+        Quotes for a known block are memoized, so pairs already quoted at
+        ``block_number`` are not requested again. Returns raw amounts out for
+        QUOTE_AMOUNT_IN along each pair's direct path, keyed by
+        (router name, token_a, token_b).
+        """
+        if block_number is not None:
+            self._evict_quotes(block_number)
+        
+        pair_quotes = {}
+        missing = []
+        for token_a, token_b in pairs:
+            cached = None
+            if block_number is not None:
+                cached = self._quote_cache.get((block_number, token_a, token_b, QUOTE_AMOUNT_IN))
+            if cached is None:
+                missing.append((token_a, token_b))
+            else:
+                pair_quotes[(token_a, token_b)] = cached
+        
+        if missing:
+            amounts_out = await self._multicall_get_amounts_out(self._quote_calls(missing), block_number)
+            n_routers = len(self._routers_c)
+            for i, (token_a, token_b) in enumerate(missing):
+                outs = tuple(amounts_out[i * n_routers:(i + 1) * n_routers])
+                pair_quotes[(token_a, token_b)] = outs
+                if block_number is not None:
+                    self._quote_cache[(block_number, token_a, token_b, QUOTE_AMOUNT_IN)] = outs
+        
+        return {
+            (name, token_a, token_b): amount_out
+            for (token_a, token_b), outs in pair_quotes.items()
+            for name, amount_out in zip(self._routers_c, outs)
+        }
+
+    def _evict_quotes(self, block_number: int):
+        """Drop memoized quotes more than two blocks older than block_number"""
+        stale = [key for key in self._quote_cache if key[0] < block_number - 2]
+        for key in stale:
+            del self._quote_cache[key]
 
+    async def get_current_prices(self, token_pairs: List[tuple],
+                                 block_number: Optional[int] = None) -> List[tuple]:
+        """Get current prices from Uniswap V2 and Sushiswap for every token pair in one batch"""
+        try:
+            quotes = await self.get_pair_quotes(token_pairs, block_number)
         except Exception as e:
-            print(f"Error in get_current_prices: {str(e)}")
-            return 0.0, 0.0
+            self.logger.log_error(f"Error in get_current_prices: {str(e)}")
+            return [(0.0, 0.0) for _ in token_pairs]
+        
+        log_prices = self.logger.is_enabled_for(logging.INFO)
+        prices = []
+        for token_a, token_b in token_pairs:
+            token_b_bytes = bytes.fromhex(token_b[2:])
+            decimals = self._decimals(token_b_bytes)
+            # Convert to floats for display only
+            uni_price = quotes[('uniswap', token_a, token_b)] / (10 ** decimals)
+            sushi_price = quotes[('sushiswap', token_a, token_b)] / (10 ** decimals)
+
+            if log_prices:
+                token_a_symbol = self._token_symbols.get(bytes.fromhex(token_a[2:]), token_a[-4:])
+                token_b_symbol = self._token_symbols.get(token_b_bytes, token_b[-4:])
+                self.logger.log_info(f"Uniswap Price: 1 {token_a_symbol} = {uni_price:.2f} {token_b_symbol}")
+                self.logger.log_info(f"Sushiswap Price: 1 {token_a_symbol} = {sushi_price:.2f} {token_b_symbol}")
+
+            prices.append((uni_price, sushi_price))
+        
+        return prices
 
     
-    async def monitor_opportunities(self, token_pairs: List[tuple]) -> List[ArbitrageOpportunity]:
+    async def monitor_opportunities(self, token_pairs: List[tuple],
+                                    block_number: Optional[int] = None) -> List[ArbitrageOpportunity]:
         """Monitor for arbitrage opportunities"""
         opportunities = []
         
-        for token_a, token_b in token_pairs:
-            # Get current prices
-            uni_price, sushi_price = await self.get_current_prices((token_a, token_b))
-            
-            # Calculate potential profit (simplified for testing)
-            price_diff = abs(uni_price - sushi_price)
-            if price_diff > 0:
-                # Test with 1 ETH
-                amount_in = 1000000000000000000  # 1 ETH in wei
-                expected_profit = int(price_diff * amount_in / min(uni_price, sushi_price))
-                gas_cost = self._estimate_gas_cost()
-                
-                if expected_profit > gas_cost:
-                    opportunities.append(ArbitrageOpportunity(
-                        token_a=token_a,
-                        token_b=token_b,
-                        amount_in=amount_in,
-                        expected_profit=expected_profit,
-                        gas_cost=gas_cost,
-                        net_profit=expected_profit - gas_cost,
-                        router1=self.routers['uniswap'],
-                        router2=self.routers['sushiswap'],
-                        reverse_order=uni_price > sushi_price,
-                        confidence_score=0.9
-                    ))
-        
-        return opportunities
-        
-        # Get current prices
-        token_addresses = []
-        for pair in token_pairs:
-            token_addresses.extend(pair)
-        
-        prices = await self.get_token_prices(token_addresses)
+        # Quote all pairs and fetch the gas price concurrently
+        quotes, gas_price_wei = await asyncio.gather(
+            self.get_pair_quotes(token_pairs, block_number),
+            self._current_gas_price(block_number),
+            return_exceptions=True
+        )
+        for result in (quotes, gas_price_wei):
+            if isinstance(result, Exception):
+                self.logger.log_error(f"Error monitoring opportunities: {result}")
+                return opportunities
+        
+        gas_cost = await self._estimate_gas_cost(gas_price_wei)
+        
+        # Screen all pairs in one compiled pass
+        pairs = [(token_a, token_b) for token_a, token_b in token_pairs]
+        uni_out = np.array([quotes[('uniswap', a, b)] for a, b in pairs], dtype=np.float64)
+        sushi_out = np.array([quotes[('sushiswap', a, b)] for a, b in pairs], dtype=np.float64)
+        # Liquidity is not quoted yet, each DEX counts as 1.0 (simplified)
+        liquidity_score = len(self.routers) / self.min_liquidity
+        mask, confidence = score_pairs(
+            uni_out, sushi_out, float(QUOTE_AMOUNT_IN), float(gas_cost),
+            float(self.min_profit_threshold_wei), liquidity_score
+        )
         
-        # Check each token pair
-        for token_a, token_b in token_pairs:
+        # Only build opportunities for the pairs that passed screening
+        debug = self.logger.is_enabled_for(logging.DEBUG)
+        for i in np.flatnonzero(mask):
+            token_a, token_b = pairs[i]
             opportunity = self.calculate_arbitrage_opportunity(
-                token_a, token_b, amount_in, prices
+                token_a, token_b, QUOTE_AMOUNT_IN, quotes, gas_cost, float(confidence[i])
             )
-            
             if opportunity:
-                # Assess risk
-                risk_assessment = self.assess_risk(opportunity)
-                
-                # Only include low-risk opportunities
-                if risk_assessment['overall_risk'] in ['low', 'medium']:
-                    opportunities.append(opportunity)
+                opportunities.append(opportunity)
+                if debug:
+                    lo = min(uni_out[i], sushi_out[i])
+                    self.logger.log_debug(
+                        f"Spread {token_a[-4:]}/{token_b[-4:]}: {(max(uni_out[i], sushi_out[i]) - lo) / lo * 100:.2f}%"
+                    )
         
         return opportunities
     
@@ -352,13 +445,13 @@ class ArbitrageMonitor:
             # This would interact with the deployed ArbExecutor contract
             # Implementation would depend on your specific setup
             
-            print(f"Executing arbitrage:")
-            print(f"  Token A: {opportunity.token_a}")
-            print(f"  Token B: {opportunity.token_b}")
-            print(f"  Amount: {opportunity.amount_in}")
-            print(f"  Expected Profit: {opportunity.expected_profit}")
-            print(f"  Net Profit: {opportunity.net_profit}")
-            print(f"  Confidence: {opportunity.confidence_score:.2f}")
+            self.logger.log_info(f"Executing arbitrage:")
+            self.logger.log_info(f"  Token A: {opportunity.token_a}")
+            self.logger.log_info(f"  Token B: {opportunity.token_b}")
+            self.logger.log_info(f"  Amount: {opportunity.amount_in}")
+            self.logger.log_info(f"  Expected Profit: {opportunity.expected_profit}")
+            self.logger.log_info(f"  Net Profit: {opportunity.net_profit}")
+            self.logger.log_info(f"  Confidence: {opportunity.confidence_score:.2f}")
             
             # Here you would call the smart contract
             # contract.functions.executeArbitrage(...).transact()
@@ -366,7 +459,7 @@ class ArbitrageMonitor:
             return True
             
         except Exception as e:
-            print(f"Error executing arbitrage: {e}")
+            self.logger.log_error(f"Error executing arbitrage: {e}")
             return False
 
 # Example usage
@@ -376,6 +469,7 @@ async def main():
         contract_address="0x96888C4B6e569c74fDbDcc40cacf1127421F993c",  # Your deployed contract address
         private_key="0xce0bbf67acfb2d7038b39cdaed5dc84ef0b48a5e1ba268fa339ac2d1c47a45f8"  # Your private key
     )
+    await monitor.connect()
     
     # Define token pairs to monitor
     token_pairs = [
@@ -383,21 +477,29 @@ async def main():
         ("0xfFf9976782d46CC05630D1f6eBAb18b2324d6B14", "0x7169D38820dfd117C3FA1f22a697dBA58d90BA06"),  # WETH-USDT
     ]
     
-    while True:
-        opportunities = await monitor.monitor_opportunities(token_pairs)
-        
-        for opportunity in opportunities:
-            print(f"Found opportunity: {opportunity.token_a} -> {opportunity.token_b}")
-            print(f"Expected profit: {opportunity.expected_profit / 1e18:.6f} ETH")
+    # Check once per new block instead of polling on a timer
+    ws_provider = WebsocketProviderV2("wss://eth-sepolia.g.alchemy.com/v2/0qBZbUmSupk6zy4Ig9GN5")
+    try:
+        async with AsyncWeb3.persistent_websocket(ws_provider) as ws_w3:
+            await ws_w3.eth.subscribe("newHeads")
             
-            # Execute if profitable enough
-            if opportunity.net_profit > 0.001 * 1e18:  # 0.001 ETH minimum
-                success = monitor.execute_arbitrage(opportunity)
-                if success:
-                    print("Arbitrage executed successfully!")
-        
-        # Wait before next check
-        await asyncio.sleep(30)  # Check every 30 seconds
+            async for payload in ws_w3.ws.process_subscriptions():
+                block_number = payload["result"]["number"]
+                opportunities = await monitor.monitor_opportunities(token_pairs, block_number)
+                
+                for opportunity in opportunities:
+                    monitor.logger.log_info(f"Found opportunity: {opportunity.token_a} -> {opportunity.token_b}")
+                    monitor.logger.log_info(f"Expected profit: {opportunity.expected_profit / 1e18:.6f} ETH")
+                    
+                    # Execute if profitable enough
+                    if opportunity.net_profit > 0.001 * 1e18:  # 0.001 ETH minimum
+                        success = monitor.execute_arbitrage(opportunity)
+                        if success:
+                            monitor.logger.log_info("Arbitrage executed successfully!")
+    finally:
+        # Release the aiohttp session and flush buffered price rows even on Ctrl-C
+        await monitor.close()
+        monitor.logger.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
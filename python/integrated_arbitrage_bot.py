@@ -25,11 +25,15 @@ Flow:
 """
 
 import asyncio
+import logging
 import time
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import aiohttp
+from web3 import AsyncWeb3, WebsocketProviderV2
 from arbitrage_monitor import ArbitrageMonitor, ArbitrageOpportunity
 from smart_contract_interaction import SmartContractInterface
-from config import TOKENS, ROUTERS, RPC_URL, CONTRACT_ADDRESS, PRIVATE_KEY
+from config import TOKENS, ROUTERS, RPC_URL, WS_URL, CONTRACT_ADDRESS, PRIVATE_KEY
 from utils.logger import ArbitrageLogger
 
 class IntegratedArbitrageBot:
@@ -40,12 +44,24 @@ class IntegratedArbitrageBot:
         self.logger = ArbitrageLogger()
         self.logger.log_info("Initializing Arbitrage Bot...")
 
+        # One event loop for the bot's whole lifetime, so the HTTP connection
+        # pool below stays warm instead of being rebuilt with every new loop
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._session = self.loop.run_until_complete(self._open_session())
+        
+        # SmartContractInterface is synchronous; its calls run on this pool
+        # so they overlap each other and don't stall the event loop
+        self._exec = ThreadPoolExecutor(max_workers=8)
+
         # Initialize the monitoring system
         self.logger.log_info("Setting up price monitoring system...")
         self.monitor = ArbitrageMonitor(
             rpc_url=RPC_URL,
             contract_address=CONTRACT_ADDRESS,
-            private_key=PRIVATE_KEY
+            private_key=PRIVATE_KEY,
+            session=self._session,
+            logger=self.logger
         )
         
         # Initialize the smart contract interface
@@ -61,6 +77,13 @@ class IntegratedArbitrageBot:
         self.executed_trades = 0
         self.total_profit = 0
         
+        # Sent transactions awaiting a receipt, resolved from the newHeads subscription
+        self._pending: Dict[bytes, asyncio.Future] = {}
+        self.receipt_timeout = 180  # seconds
+        
+        # Newest block head for the cycle loop; stale heads are dropped while a cycle runs
+        self._heads: asyncio.Queue = asyncio.Queue(maxsize=1)
+        
         # Performance tracking
         self.start_time = time.time()
         self.total_opportunities_found = 0
@@ -70,28 +93,95 @@ class IntegratedArbitrageBot:
         print(f"   Contract: {CONTRACT_ADDRESS}")
         print(f"   Account: {self.contract_interface.account.address}")
     
-    async def run_arbitrage_cycle(self, token_pairs: List[tuple]) -> List[ArbitrageOpportunity]:
-        """Run one complete arbitrage cycle"""
+    @staticmethod
+    async def _open_session() -> aiohttp.ClientSession:
+        """Create the HTTP session shared by every RPC call the bot makes"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=120)
+        )
+    
+    async def close(self):
+        """Close the bot's shared HTTP session and thread pool"""
+        await self.monitor.close()
+        await self._session.close()
+        self._exec.shutdown(wait=False)
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking contract call on the shared thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._exec, func, *args)
+    
+    async def _watch_heads(self, ws_w3):
+        """Consume newHeads: settle pending receipts, then hand the block to the cycle loop"""
+        try:
+            async for payload in ws_w3.ws.process_subscriptions():
+                if self._pending:
+                    await self._resolve_receipts()
+                self._push_head(payload["result"]["number"])
+            self._push_head(ConnectionError("newHeads subscription ended"))
+        except Exception as e:
+            # Hand the failure to the cycle loop instead of leaving it waiting
+            self._push_head(e)
+    
+    def _push_head(self, head):
+        """Replace any unconsumed head with the newest one"""
+        if self._heads.full():
+            self._heads.get_nowait()
+        self._heads.put_nowait(head)
+    
+    async def _resolve_receipts(self):
+        """Fetch receipts for every pending transaction in one batch and resolve the mined ones"""
+        tx_hashes = list(self._pending)
+        try:
+            receipts = await self._run_blocking(self.contract_interface.get_receipts, tx_hashes)
+        except Exception as e:
+            # Try again on the next block
+            self.logger.log_error(f"Error fetching receipts: {e}")
+            return
+        
+        for tx_hash, receipt in zip(tx_hashes, receipts):
+            if receipt is None:
+                continue
+            # The waiter may have timed out and dropped its entry during the fetch
+            future = self._pending.pop(tx_hash, None)
+            if future is not None and not future.done():
+                future.set_result(receipt)
+    
+    async def _wait_for_receipt(self, tx_hash: bytes):
+        """Wait for the block that mines tx_hash instead of polling for its receipt"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tx_hash] = future
+        try:
+            return await asyncio.wait_for(future, self.receipt_timeout)
+        finally:
+            self._pending.pop(tx_hash, None)
+    
+    async def run_arbitrage_cycle(self, token_pairs: List[tuple],
+                                  block_number: Optional[int] = None) -> List[ArbitrageOpportunity]:
+        """Run one complete arbitrage cycle against the state at block_number"""
         cycle_start = time.time()
         self.logger.log_info("\n=== Starting New Arbitrage Cycle ===")
         
         # Step 1: Monitor for opportunities using Python
         self.logger.log_info("Checking prices on DEXs...")
-        for pair in token_pairs:
-            # Get and log prices for each pair
-            uni_price, sushi_price = await self.monitor.get_current_prices(pair)
+        prices = await self.monitor.get_current_prices(token_pairs, block_number)
+        log_prices = self.logger.is_enabled_for(logging.INFO)
+        log_spread = self.logger.is_enabled_for(logging.DEBUG)
+        for pair, (uni_price, sushi_price) in zip(token_pairs, prices):
+            # Log prices for each pair
             self.logger.log_prices(
                 token_pair=pair,
                 uni_price=uni_price,
                 sushi_price=sushi_price
             )
-            self.logger.log_info(f"Price check: {pair[0]}/{pair[1]}")
-            self.logger.log_info(f"  Uniswap: {uni_price:.6f}")
-            self.logger.log_info(f"  Sushiswap: {sushi_price:.6f}")
-            self.logger.log_info(f"  Difference: {abs(uni_price - sushi_price):.6f} ({abs(uni_price - sushi_price)/min(uni_price, sushi_price)*100:.2f}%)")
+            if log_prices:
+                self.logger.log_info(f"Price check: {pair[0]}/{pair[1]}")
+                self.logger.log_info(f"  Uniswap: {uni_price:.6f}")
+                self.logger.log_info(f"  Sushiswap: {sushi_price:.6f}")
+            if log_spread and uni_price and sushi_price:
+                self.logger.log_debug(f"  Difference: {abs(uni_price - sushi_price):.6f} ({abs(uni_price - sushi_price)/min(uni_price, sushi_price)*100:.2f}%)")
         
         # Find opportunities
-        opportunities = await self.monitor.monitor_opportunities(token_pairs)
+        opportunities = await self.monitor.monitor_opportunities(token_pairs, block_number)
         
         if not opportunities:
             self.logger.log_info("No profitable opportunities found in this cycle")
@@ -101,30 +191,34 @@ class IntegratedArbitrageBot:
         self.logger.log_info(f"Found {len(opportunities)} potential opportunities")
         
         # Step 2: Validate opportunities using smart contract
-        validated_opportunities = []
-        for opp in opportunities:
-            print(f"\n   Validating opportunity: {opp.token_a[:10]}... -> {opp.token_b[:10]}...")
-            
-            # Double-check with smart contract
-            contract_profit = self.contract_interface.check_arbitrage_opportunity(
+        # Double-check every opportunity with the contract concurrently
+        contract_profits = await asyncio.gather(*(
+            self._run_blocking(
+                self.contract_interface.check_arbitrage_opportunity,
                 opp.token_a, opp.token_b, opp.amount_in,
                 ROUTERS["UNISWAP_V2"], ROUTERS["SUSHISWAP"], opp.reverse_order
             )
-            
-            print(f"     Python profit: {opp.expected_profit / 1e18:.6f} ETH")
-            print(f"     Contract profit: {contract_profit / 1e18:.6f} ETH")
+            for opp in opportunities
+        ))
+        
+        validated_opportunities = []
+        for opp, contract_profit in zip(opportunities, contract_profits):
+            self.logger.log_info(f"Validating opportunity: {opp.token_a[:10]}... -> {opp.token_b[:10]}...")
+            self.logger.log_info(f"  Python profit: {opp.expected_profit / 1e18:.6f} ETH")
+            self.logger.log_info(f"  Contract profit: {contract_profit / 1e18:.6f} ETH")
             
             # Validate that both systems agree (within 10% tolerance)
             if abs(opp.expected_profit - contract_profit) / max(opp.expected_profit, contract_profit) < 0.1:
                 validated_opportunities.append(opp)
-                print(f"     ✅ Validation passed")
+                self.logger.log_info("  Validation passed")
             else:
-                print(f"     ❌ Validation failed - profit mismatch")
+                self.logger.log_info("  Validation failed - profit mismatch")
         
         return validated_opportunities
     
-    async def execute_opportunity(self, opportunity: ArbitrageOpportunity) -> bool:
-        """Execute a validated arbitrage opportunity"""
+    async def execute_opportunity(self, opportunity: ArbitrageOpportunity,
+                                  block_number: Optional[int] = None) -> bool:
+        """Execute a validated arbitrage opportunity found at block_number"""
         self.logger.log_info("\n=== Executing Arbitrage Opportunity ===")
         
         # Log detailed opportunity information
@@ -147,30 +241,39 @@ class IntegratedArbitrageBot:
         self.logger.log_info(f"  Net profit: {opportunity.net_profit / 1e18:.6f} ETH")
         
         # Check if we have enough balance
-        current_balance = self.contract_interface.get_token_balance(opportunity.token_a)
+        current_balance = await self._run_blocking(self.contract_interface.get_token_balance, opportunity.token_a)
         if current_balance < opportunity.amount_in:
-            print(f"   ❌ Insufficient balance: {current_balance / 1e18:.6f} < {opportunity.amount_in / 1e18:.6f}")
+            self.logger.log_error(f"Insufficient balance: {current_balance / 1e18:.6f} < {opportunity.amount_in / 1e18:.6f}")
             return False
         
         # Execute arbitrage using smart contract
-        success = self.contract_interface.execute_arbitrage(
+        tx_hash = await self._run_blocking(
+            self.contract_interface.send_arbitrage,
             opportunity.token_a, opportunity.token_b, opportunity.amount_in,
-            ROUTERS["UNISWAP_V2"], ROUTERS["SUSHISWAP"], opportunity.reverse_order
+            ROUTERS["UNISWAP_V2"], ROUTERS["SUSHISWAP"], opportunity.reverse_order,
+            block_number
         )
+        success = False
+        if tx_hash is not None:
+            try:
+                receipt = await self._wait_for_receipt(tx_hash)
+                success = self.contract_interface.report_arbitrage_receipt(receipt)
+            except asyncio.TimeoutError:
+                self.logger.log_error(f"No receipt for {tx_hash.hex()} after {self.receipt_timeout}s")
         
         if success:
             self.executed_trades += 1
             self.total_profit += opportunity.net_profit
-            print(f"   ✅ Arbitrage executed successfully!")
-            print(f"   📊 Total trades: {self.executed_trades}")
-            print(f"   💰 Total profit: {self.total_profit / 1e18:.6f} ETH")
+            self.logger.log_info("Arbitrage executed successfully!")
+            self.logger.log_info(f"  Total trades: {self.executed_trades}")
+            self.logger.log_info(f"  Total profit: {self.total_profit / 1e18:.6f} ETH")
         else:
-            print(f"   ❌ Arbitrage execution failed")
+            self.logger.log_error("Arbitrage execution failed")
         
         return success
     
     async def run_bot(self, token_pairs: List[tuple], max_cycles: int = 10):
-        """Run the complete arbitrage bot"""
+        """Run the complete arbitrage bot, one cycle per new block"""
         print("🚀 Starting Integrated Arbitrage Bot")
         print("=" * 50)
         
@@ -178,24 +281,43 @@ class IntegratedArbitrageBot:
         cycle_count = 0
         
         try:
-            while self.is_running and cycle_count < max_cycles:
-                cycle_count += 1
-                print(f"\n📊 Cycle {cycle_count}/{max_cycles}")
-                
-                # Run arbitrage cycle
-                opportunities = await self.run_arbitrage_cycle(token_pairs)
+            await self.monitor.connect()
+            
+            # Encode the quote batch now so the first cycle doesn't pay for it
+            self.monitor.warm_calldata(token_pairs)
+            
+            # Subscribe to new blocks so each cycle runs as soon as state changes
+            async with AsyncWeb3.persistent_websocket(WebsocketProviderV2(WS_URL)) as ws_w3:
+                await ws_w3.eth.subscribe("newHeads")
+                print(f"\n⏳ Waiting for new blocks...")
                 
-                # Execute profitable opportunities
-                for opportunity in opportunities:
-                    if opportunity.net_profit > 1000000000000000:  # > 0.001 ETH
-                        await self.execute_opportunity(opportunity)
+                # Heads are consumed in the background so receipts keep
+                # resolving while a cycle waits on its own transaction
+                watcher = asyncio.create_task(self._watch_heads(ws_w3))
+                try:
+                    while self.is_running:
+                        block_number = await self._heads.get()
+                        if isinstance(block_number, Exception):
+                            raise block_number
                         
-                        # Small delay between trades
-                        await asyncio.sleep(5)
-                
-                # Wait before next cycle
-                print(f"\n⏳ Waiting 30 seconds before next cycle...")
-                await asyncio.sleep(30)
+                        cycle_count += 1
+                        print(f"\n📊 Cycle {cycle_count}/{max_cycles} (block {block_number})")
+                        
+                        # Run arbitrage cycle
+                        opportunities = await self.run_arbitrage_cycle(token_pairs, block_number)
+                        
+                        # Execute profitable opportunities
+                        for opportunity in opportunities:
+                            if opportunity.net_profit > 1000000000000000:  # > 0.001 ETH
+                                await self.execute_opportunity(opportunity, block_number)
+                                
+                                # Small delay between trades
+                                await asyncio.sleep(5)
+                        
+                        if cycle_count >= max_cycles:
+                            break
+                finally:
+                    watcher.cancel()
                 
         except KeyboardInterrupt:
             print("\n🛑 Bot stopped by user")
@@ -212,6 +334,15 @@ class IntegratedArbitrageBot:
         """Stop the arbitrage bot"""
         self.is_running = False
         print("🛑 Stopping arbitrage bot...")
+    
+    def run(self, token_pairs: List[tuple], max_cycles: int = 10):
+        """Run the bot to completion on its own event loop, then release connections"""
+        try:
+            self.loop.run_until_complete(self.run_bot(token_pairs, max_cycles))
+        finally:
+            self.loop.run_until_complete(self.close())
+            self.loop.close()
+            self.logger.stop()
 
 def main():
     """Main function to run the integrated arbitrage bot"""
@@ -227,7 +358,7 @@ def main():
     bot = IntegratedArbitrageBot()
     
     # Run the bot
-    asyncio.run(bot.run_bot(token_pairs, max_cycles=5))
+    bot.run(token_pairs, max_cycles=5)
 
 if __name__ == "__main__":
     main()
@@ -1,96 +1,132 @@
+import asyncio
+import os
+
+import aiohttp
+import orjson
 from web3 import Web3
 
+from utils.amm import v2_quote
+from utils.rpc import OrjsonHTTPProvider, OrjsonJSONProvider, make_request_session
+
 # -------------------------
 # Setup
 # -------------------------
-rpc_url = "http://127.0.0.1:8545"
-w3 = Web3(Web3.HTTPProvider(rpc_url))
+# Point this at a local fork (`anvil --fork-url $RPC_URL`): anvil runs calls in-process on
+# revm and caches forked state, so repeated quotes never leave the machine
+rpc_url = os.getenv("SIM_RPC_URL", "http://127.0.0.1:8545")
+# Keep-alive session so sync calls reuse one pooled connection
+w3 = Web3(OrjsonHTTPProvider(rpc_url, session=make_request_session()))
 print("Connected:", w3.is_connected())
 
-# Routers
-UNISWAP_ROUTER = Web3.to_checksum_address("0x7a250d5630B4cF539739dF2C5dAcb4c659F2488D")
-SUSHISWAP_ROUTER = Web3.to_checksum_address("0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F")
-
-router_abi = [
-    {
-        "name": "getAmountsOut",
-        "outputs": [{"type": "uint256[]", "name": ""}],
-        "inputs": [
-            {"type": "uint256", "name": "amountIn"},
-            {"type": "address[]", "name": "path"}
-        ],
-        "stateMutability": "view",
-        "type": "function"
-    }
-]
+# WETH/USDC V2 pairs of the Uniswap and SushiSwap routers (addresses are stored already checksummed);
+# quotes are computed from their reserves
+UNISWAP_PAIR = "0xB4e16d0168e52d35CaCD2c6185b44281Ec28C9Dc"
+SUSHISWAP_PAIR = "0x397FF1542F962076D0bFE58ea045FfA2d0D3f39A"
+
+# Multicall3 (same address on every chain) reads both pairs in one eth_call
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
-uni = w3.eth.contract(address=UNISWAP_ROUTER, abi=router_abi)
-sushi = w3.eth.contract(address=SUSHISWAP_ROUTER, abi=router_abi)
+# Function selectors, hashed once; calldata is ABI-encoded directly rather than through contract objects
+GET_RESERVES_SELECTOR = w3.keccak(text="getReserves()")[:4]
+AGGREGATE3_SELECTOR = w3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
 
 TOKENS = {
-    "WETH": Web3.to_checksum_address("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"),
-    "USDC": Web3.to_checksum_address("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"),
+    "WETH": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+    "USDC": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
 }
 
 # -------------------------
 # Helpers
 # -------------------------
-def get_price(router, amount_in):
-    path = [TOKENS["WETH"], TOKENS["USDC"]]
-    return router.functions.getAmountsOut(amount_in, path).call()[1]
-
-# -------------------------
-# Arbitrage check
-# -------------------------
-amount_in = w3.to_wei(1, "ether")  # 1 WETH
-
-uni_out = get_price(uni, amount_in)
-sushi_out = get_price(sushi, amount_in)
-
-print(f"💹 Uniswap (raw): {uni_out/1e6:.2f} USDC")
-print(f"🍣 SushiSwap (raw): {sushi_out/1e6:.2f} USDC")
-
-# Slippage assumptions
-SLIPPAGE = {
-    "Uniswap": 0.005,   # 1.5%
-    "SushiSwap": 0.005  # 0.5%
-}
+# Encodes raw JSON-RPC requests; they are sent over aiohttp, not web3's provider
+rpc = OrjsonJSONProvider()
+
+async def rpc_call(session, method, params):
+    """Send one JSON-RPC request over the shared aiohttp session"""
+    async with session.post(rpc_url, data=rpc.encode_rpc_request(method, params),
+                            headers={"Content-Type": "application/json"}) as resp:
+        reply = orjson.loads(await resp.read())
+    if "error" in reply:
+        raise ValueError(reply["error"])
+    return reply["result"]
+
+async def get_prices(session, pairs, amount_in):
+    """Quote WETH → USDC on every V2 pair from reserves read in a single Multicall3 call
+
+    getAmountsOut is deterministic given the reserves, so the quote itself is
+    local integer math instead of another router call.
+    """
+    calls = [(pair, False, GET_RESERVES_SELECTOR) for pair in pairs]
+    data = AGGREGATE3_SELECTOR + w3.codec.encode(["(address,bool,bytes)[]"], [calls])
+    raw = await rpc_call(session, "eth_call", [{"to": MULTICALL3_ADDRESS, "data": w3.to_hex(data)}, "latest"])
+    results = w3.codec.decode(["(bool,bytes)[]"], bytes.fromhex(raw[2:]))[0]
+    # Pairs sort tokens by address, so WETH is reserve0 only if it has the lower address
+    weth_is_token0 = int(TOKENS["WETH"], 16) < int(TOKENS["USDC"], 16)
+    quotes = []
+    for _, ret in results:
+        r0, r1, _ = w3.codec.decode(["uint112", "uint112", "uint32"], ret)
+        r_in, r_out = (r0, r1) if weth_is_token0 else (r1, r0)
+        quotes.append(v2_quote(amount_in, r_in, r_out))
+    return quotes
+
+async def main():
+    # -------------------------
+    # Arbitrage check
+    # -------------------------
+    amount_in = w3.to_wei(1, "ether")  # 1 WETH
+
+    # Quote both routers and read the gas price concurrently over one session
+    async with aiohttp.ClientSession() as session:
+        (uni_out, sushi_out), gas_price_hex = await asyncio.gather(
+            get_prices(session, [UNISWAP_PAIR, SUSHISWAP_PAIR], amount_in),
+            rpc_call(session, "eth_gasPrice", [])
+        )
+    gas_price = int(gas_price_hex, 16)
+
+    print(f"💹 Uniswap (raw): {uni_out/1e6:.2f} USDC")
+    print(f"🍣 SushiSwap (raw): {sushi_out/1e6:.2f} USDC")
+
+    # Slippage assumptions, in basis points
+    SLIPPAGE_BP = {
+        "Uniswap": 50,   # 0.5%
+        "SushiSwap": 50  # 0.5%
+    }
 
-# Adjusted after slippage
-uni_adj = uni_out * (1 - SLIPPAGE["Uniswap"])
-sushi_adj = sushi_out * (1 - SLIPPAGE["SushiSwap"])
+    # Adjusted after slippage; amounts stay in USDC base units (1e-6) until printed
+    uni_adj = uni_out * (10_000 - SLIPPAGE_BP["Uniswap"]) // 10_000
+    sushi_adj = sushi_out * (10_000 - SLIPPAGE_BP["SushiSwap"]) // 10_000
 
-print(f"💹 Uniswap (after slippage): {uni_adj/1e6:.2f} USDC")
-print(f"🍣 SushiSwap (after slippage): {sushi_adj/1e6:.2f} USDC")
+    print(f"💹 Uniswap (after slippage): {uni_adj/1e6:.2f} USDC")
+    print(f"🍣 SushiSwap (after slippage): {sushi_adj/1e6:.2f} USDC")
 
-# Decide trade direction
-if sushi_adj > uni_adj:
-    print("🚀 Buy on Uni, Sell on Sushi")
-    buy_price, sell_price = uni_adj, sushi_adj
-else:
-    print("🚀 Buy on Sushi, Sell on Uni")
-    buy_price, sell_price = sushi_adj, uni_adj
+    # Decide trade direction
+    if sushi_adj > uni_adj:
+        print("🚀 Buy on Uni, Sell on Sushi")
+        buy_price, sell_price = uni_adj, sushi_adj
+    else:
+        print("🚀 Buy on Sushi, Sell on Uni")
+        buy_price, sell_price = sushi_adj, uni_adj
 
-# -------------------------
-# Economics
-# -------------------------
-price_diff = sell_price - buy_price
+    # -------------------------
+    # Economics
+    # -------------------------
+    price_diff = sell_price - buy_price
 
-# Gas assumption (typical swap ~150k gas)
-gas_est = 150_000
-gas_price = w3.eth.gas_price
-gas_cost_eth = gas_est * gas_price / 1e18
+    # Gas assumption (typical swap ~150k gas)
+    gas_est = 150_000
+    gas_cost_wei = gas_est * gas_price
 
-# Convert gas to USDC using WETH→USDC rate
-eth_price_usdc = buy_price / 1e18
-gas_cost_usdc = gas_cost_eth * eth_price_usdc
+    # Convert gas to USDC base units at the buy price (USDC per amount_in of WETH)
+    gas_cost_usdc = gas_cost_wei * buy_price // amount_in
 
-print(f"🔀 Price difference (after slippage): {price_diff/1e6:.4f} USDC")
-print(f"⛽ Gas cost: {gas_cost_usdc:.4f} USDC (approx)")
+    print(f"🔀 Price difference (after slippage): {price_diff/1e6:.4f} USDC")
+    print(f"⛽ Gas cost: {gas_cost_usdc/1e6:.4f} USDC (approx)")
 
-potential_profit = (price_diff / 1e6) - gas_cost_usdc
-print(f"📊 Potential Profit (after slippage): {potential_profit:.4f} USDC")
+    potential_profit = price_diff - gas_cost_usdc
+    print(f"📊 Potential Profit (after slippage): {potential_profit/1e6:.4f} USDC")
 
+if __name__ == "__main__":
+    asyncio.run(main())
 
 
 
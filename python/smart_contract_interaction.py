@@ -4,17 +4,37 @@ Smart Contract Interaction - How Python interacts with Solidity
 """
 
 from web3 import Web3
+from web3.datastructures import AttributeDict
+from web3.exceptions import TransactionNotFound
 import json
-from typing import Dict, List, Optional
-from config import RPC_URL, CONTRACT_ADDRESS, PRIVATE_KEY, TOKENS, ROUTERS
+import time
+from typing import Dict, List, Optional, Tuple
+from config import RPC_URL, IPC_PATH, CONTRACT_ADDRESS, PRIVATE_KEY, TOKENS, ROUTERS
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
+from utils.rpc import RPC_TIMEOUT, OrjsonHTTPProvider, make_request_session, rpc_batch
+
+CHECK_ARBITRAGE_SELECTOR = Web3.keccak(
+    text='checkArbitrageOpportunity(address,address,uint256,address,address,bool)'
+)[:4]
 
 class SmartContractInterface:
     """Interface for interacting with the ArbExecutor smart contract"""
     
     def __init__(self, rpc_url: str, contract_address: str, private_key: str):
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.rpc_url = rpc_url
+        if IPC_PATH:
+            # Local node: talk over its IPC socket instead of HTTP
+            self.session = None
+            self.w3 = Web3(Web3.IPCProvider(IPC_PATH, timeout=RPC_TIMEOUT))
+        else:
+            # Reuse pooled keep-alive connections for every RPC call
+            self.session = make_request_session()
+            self.w3 = Web3(OrjsonHTTPProvider(
+                rpc_url,
+                request_kwargs={'timeout': RPC_TIMEOUT},
+                session=self.session
+            ))
         
         # For Sepolia and other PoA networks
         from web3.middleware.signing import construct_sign_and_send_raw_middleware
@@ -32,6 +52,10 @@ class SmartContractInterface:
             abi=self.contract_abi
         )
         
+        # (block_number, gas_price, next nonce), reused until a new block arrives
+        self._tx_cache: Optional[Tuple[int, int, int]] = None
+        self._chain_id: Optional[int] = None
+        
         print(f"✅ Connected to contract at {contract_address}")
         print(f"✅ Account: {self.account.address}")
     
@@ -78,6 +102,20 @@ class SmartContractInterface:
                 "stateMutability": "nonpayable",
                 "type": "function"
             },
+            {
+                "inputs": [
+                    {"internalType": "address", "name": "token", "type": "address"},
+                    {"internalType": "uint256", "name": "amount", "type": "uint256"},
+                    {"internalType": "uint256", "name": "deadline", "type": "uint256"},
+                    {"internalType": "uint8", "name": "v", "type": "uint8"},
+                    {"internalType": "bytes32", "name": "r", "type": "bytes32"},
+                    {"internalType": "bytes32", "name": "s", "type": "bytes32"}
+                ],
+                "name": "permitAndDeposit",
+                "outputs": [],
+                "stateMutability": "nonpayable",
+                "type": "function"
+            },
             {
                 "inputs": [
                     {"internalType": "address", "name": "token", "type": "address"},
@@ -111,14 +149,60 @@ class SmartContractInterface:
             }
         ]
     
+    def _tx_common(self, block_number: Optional[int] = None) -> Dict:
+        """Get gas price and nonce, refetching them only once per block.
+
+        Callers that already know the head (e.g. from newHeads) pass block_number
+        to save the eth_blockNumber round trip.
+        """
+        if block_number is None:
+            block_number = self.w3.eth.block_number
+        if self._tx_cache is None or self._tx_cache[0] != block_number:
+            address = self.account.address
+            if self.session is None:
+                # IPC has no HTTP round trip to save
+                gas_price = self.w3.eth.gas_price
+                nonce = self.w3.eth.get_transaction_count(address, 'pending')
+                if self._chain_id is None:
+                    self._chain_id = self.w3.eth.chain_id
+            else:
+                calls = [('eth_gasPrice', []), ('eth_getTransactionCount', [address, 'pending'])]
+                if self._chain_id is None:
+                    calls.append(('eth_chainId', []))
+                results = [int(result, 16) for result in rpc_batch(self.session, self.rpc_url, calls)]
+                gas_price, nonce = results[0], results[1]
+                if self._chain_id is None:
+                    self._chain_id = results[2]
+            self._tx_cache = (block_number, gas_price, nonce)
+        
+        _, gas_price, nonce = self._tx_cache
+        return {'gasPrice': gas_price, 'nonce': nonce}
+    
+    def _advance_nonce(self):
+        """Account for a sent transaction so the next one in this block gets a fresh nonce"""
+        block_number, gas_price, nonce = self._tx_cache
+        self._tx_cache = (block_number, gas_price, nonce + 1)
+    
+    def _tx_params(self, gas: int, block_number: Optional[int] = None) -> Dict:
+        """Build transaction defaults from the per-block cache"""
+        return {
+            'from': self.account.address,
+            'gas': gas,
+            **self._tx_common(block_number),
+            'chainId': self._chain_id,
+        }
+    
     def check_arbitrage_opportunity(self, token_a: str, token_b: str, amount_in: int, 
                                    router1: str, router2: str, reverse_order: bool) -> int:
         """Check arbitrage opportunity using the smart contract"""
         try:
-            # Call the view function (no gas cost)
-            profit = self.contract.functions.checkArbitrageOpportunity(
-                token_a, token_b, amount_in, router1, router2, reverse_order
-            ).call()
+            # Call the view function (no gas cost) with raw calldata, skipping the ContractFunction pipeline
+            data = CHECK_ARBITRAGE_SELECTOR + self.w3.codec.encode(
+                ['address', 'address', 'uint256', 'address', 'address', 'bool'],
+                [token_a, token_b, amount_in, router1, router2, reverse_order]
+            )
+            raw = self.w3.eth.call({'to': self.contract.address, 'data': data}, 'latest')
+            profit = self.w3.codec.decode(['uint256'], raw)[0]
             
             return profit
             
@@ -126,49 +210,136 @@ class SmartContractInterface:
             print(f"❌ Error checking arbitrage opportunity: {e}")
             return 0
     
-    def execute_arbitrage(self, token_a: str, token_b: str, amount_in: int,
-                         router1: str, router2: str, reverse_order: bool) -> bool:
-        """Execute arbitrage using the smart contract"""
+    def send_arbitrage(self, token_a: str, token_b: str, amount_in: int,
+                       router1: str, router2: str, reverse_order: bool,
+                       block_number: Optional[int] = None) -> Optional[bytes]:
+        """Send an arbitrage transaction without waiting for it to be mined"""
         try:
             # Build transaction
             transaction = self.contract.functions.executeArbitrage(
                 token_a, token_b, amount_in, router1, router2, reverse_order
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 500000,  # Gas limit
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-            })
+            ).build_transaction(self._tx_params(500000, block_number))
             
             # Sign transaction
             signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
             
             # Send transaction
             tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            self._advance_nonce()
             
             print(f"✅ Arbitrage transaction sent: {tx_hash.hex()}")
+            return tx_hash
             
+        except Exception as e:
+            print(f"❌ Error executing arbitrage: {e}")
+            return None
+    
+    def execute_arbitrage(self, token_a: str, token_b: str, amount_in: int,
+                         router1: str, router2: str, reverse_order: bool) -> bool:
+        """Execute arbitrage using the smart contract"""
+        tx_hash = self.send_arbitrage(token_a, token_b, amount_in, router1, router2, reverse_order)
+        if tx_hash is None:
+            return False
+        
+        try:
             # Wait for transaction receipt
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            if receipt.status == 1:
-                print(f"✅ Arbitrage executed successfully!")
-                print(f"   Gas used: {receipt.gasUsed}")
-                print(f"   Block: {receipt.blockNumber}")
-                return True
-            else:
-                print(f"❌ Arbitrage transaction failed")
-                return False
+            return self.report_arbitrage_receipt(receipt)
                 
         except Exception as e:
             print(f"❌ Error executing arbitrage: {e}")
             return False
     
+    def report_arbitrage_receipt(self, receipt) -> bool:
+        """Print the outcome of a mined arbitrage transaction and return whether it succeeded"""
+        if receipt.status == 1:
+            print(f"✅ Arbitrage executed successfully!")
+            print(f"   Gas used: {receipt.gasUsed}")
+            print(f"   Block: {receipt.blockNumber}")
+            return True
+        else:
+            print(f"❌ Arbitrage transaction failed")
+            return False
+    
+    def get_receipts(self, tx_hashes: List[bytes]) -> List[Optional[AttributeDict]]:
+        """Fetch receipts for several transactions at once; None for any not yet mined"""
+        if self.session is None:
+            # IPC has no HTTP round trip to save
+            receipts = []
+            for tx_hash in tx_hashes:
+                try:
+                    receipts.append(self.w3.eth.get_transaction_receipt(tx_hash))
+                except TransactionNotFound:
+                    receipts.append(None)
+            return receipts
+        
+        results = rpc_batch(
+            self.session, self.rpc_url,
+            [('eth_getTransactionReceipt', [Web3.to_hex(tx_hash)]) for tx_hash in tx_hashes]
+        )
+        return [
+            None if result is None else AttributeDict({
+                'status': int(result['status'], 16),
+                'gasUsed': int(result['gasUsed'], 16),
+                'blockNumber': int(result['blockNumber'], 16),
+            })
+            for result in results
+        ]
+    
+    def _sign_permit(self, token_contract, amount: int, ttl: int = 600) -> Optional[tuple]:
+        """Sign an EIP-2612 permit for the contract, or return None if the token has no permit.
+
+        A signature is only a candidate: deposit_tokens checks it by simulation before use.
+        """
+        owner = self.account.address
+        try:
+            nonce = token_contract.functions.nonces(owner).call()
+            name = token_contract.functions.name().call()
+        except Exception:
+            return None
+        try:
+            version = token_contract.functions.version().call()
+        except Exception:
+            version = "1"  # OpenZeppelin ERC20Permit default
+        
+        deadline = int(time.time()) + ttl
+        chain_id = self._chain_id if self._chain_id is not None else self.w3.eth.chain_id
+        signed = Account.sign_typed_data(self.private_key, full_message={
+            "types": {
+                "EIP712Domain": [
+                    {"name": "name", "type": "string"},
+                    {"name": "version", "type": "string"},
+                    {"name": "chainId", "type": "uint256"},
+                    {"name": "verifyingContract", "type": "address"},
+                ],
+                "Permit": [
+                    {"name": "owner", "type": "address"},
+                    {"name": "spender", "type": "address"},
+                    {"name": "value", "type": "uint256"},
+                    {"name": "nonce", "type": "uint256"},
+                    {"name": "deadline", "type": "uint256"},
+                ],
+            },
+            "primaryType": "Permit",
+            "domain": {
+                "name": name,
+                "version": version,
+                "chainId": chain_id,
+                "verifyingContract": token_contract.address,
+            },
+            "message": {
+                "owner": owner,
+                "spender": self.contract_address,
+                "value": amount,
+                "nonce": nonce,
+                "deadline": deadline,
+            },
+        })
+        return deadline, signed.v, signed.r.to_bytes(32, 'big'), signed.s.to_bytes(32, 'big')
+    
     def deposit_tokens(self, token_address: str, amount: int) -> bool:
-        """Deposit tokens to the contract"""
+        """Deposit tokens to the contract, approving with a permit signature when possible"""
         try:
-            # First, we need to approve the contract to spend our tokens
-            # This requires interacting with the ERC20 token contract
             token_abi = [
                 {
                     "inputs": [
@@ -179,6 +350,27 @@ class SmartContractInterface:
                     "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
                     "stateMutability": "nonpayable",
                     "type": "function"
+                },
+                {
+                    "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
+                    "name": "nonces",
+                    "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+                    "stateMutability": "view",
+                    "type": "function"
+                },
+                {
+                    "inputs": [],
+                    "name": "name",
+                    "outputs": [{"internalType": "string", "name": "", "type": "string"}],
+                    "stateMutability": "view",
+                    "type": "function"
+                },
+                {
+                    "inputs": [],
+                    "name": "version",
+                    "outputs": [{"internalType": "string", "name": "", "type": "string"}],
+                    "stateMutability": "view",
+                    "type": "function"
                 }
             ]
             
@@ -187,32 +379,37 @@ class SmartContractInterface:
                 abi=token_abi
             )
             
-            # Approve contract to spend tokens
-            approve_tx = token_contract.functions.approve(
-                self.contract_address, amount
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 100000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-            })
-            
-            signed_approve = self.w3.eth.account.sign_transaction(approve_tx, self.private_key)
-            approve_hash = self.w3.eth.send_raw_transaction(signed_approve.rawTransaction)
-            self.w3.eth.wait_for_transaction_receipt(approve_hash)
-            
-            # Now deposit tokens
-            deposit_tx = self.contract.functions.depositToken(
-                token_address, amount
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 200000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-            })
+            permit = self._sign_permit(token_contract, amount)
+            deposit_tx = None
+            if permit is not None:
+                # The contract applies the signed approval and pulls the tokens in one transaction.
+                # Tokens like DAI answer nonces() and name() but take a different permit, which
+                # permitAndDeposit would swallow before the transfer reverts, so simulate it first
+                permit_call = self.contract.functions.permitAndDeposit(token_address, amount, *permit)
+                try:
+                    permit_gas = permit_call.estimate_gas({'from': self.account.address})
+                except Exception:
+                    permit_gas = None
+                if permit_gas is not None:
+                    deposit_tx = permit_call.build_transaction(self._tx_params(permit_gas * 12 // 10))
+            if deposit_tx is None:
+                # No usable permit: send approve and deposit back to back. Sequential
+                # nonces keep them ordered, so there's no need to wait for the approve receipt
+                approve_tx = token_contract.functions.approve(
+                    self.contract_address, amount
+                ).build_transaction(self._tx_params(100000))
+                
+                signed_approve = self.w3.eth.account.sign_transaction(approve_tx, self.private_key)
+                self.w3.eth.send_raw_transaction(signed_approve.rawTransaction)
+                self._advance_nonce()
+                
+                deposit_tx = self.contract.functions.depositToken(
+                    token_address, amount
+                ).build_transaction(self._tx_params(200000))
             
             signed_deposit = self.w3.eth.account.sign_transaction(deposit_tx, self.private_key)
             deposit_hash = self.w3.eth.send_raw_transaction(signed_deposit.rawTransaction)
+            self._advance_nonce()
             receipt = self.w3.eth.wait_for_transaction_receipt(deposit_hash)
             
             if receipt.status == 1:
@@ -240,15 +437,11 @@ class SmartContractInterface:
         try:
             withdraw_tx = self.contract.functions.withdrawProfit(
                 token_address, amount
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 150000,
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-            })
+            ).build_transaction(self._tx_params(150000))
             
             signed_withdraw = self.w3.eth.account.sign_transaction(withdraw_tx, self.private_key)
             withdraw_hash = self.w3.eth.send_raw_transaction(signed_withdraw.rawTransaction)
+            self._advance_nonce()
             receipt = self.w3.eth.wait_for_transaction_receipt(withdraw_hash)
             
             if receipt.status == 1:
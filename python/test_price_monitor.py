@@ -3,8 +3,101 @@
 Test script to monitor real-time DEX prices
 """
 import asyncio
-from arbitrage_monitor import ArbitrageMonitor
-from config import TOKENS, RPC_URL, CONTRACT_ADDRESS, PRIVATE_KEY
+from dataclasses import dataclass
+from hexbytes import HexBytes
+from web3 import AsyncWeb3, WebsocketProviderV2
+from arbitrage_monitor import ArbitrageMonitor, QUOTE_AMOUNT_IN
+from utils.amm import v2_quote
+from config import TOKENS, RPC_URL, WS_URL, CONTRACT_ADDRESS, PRIVATE_KEY
+
+# Token address -> symbol, built once
+SYMBOLS = {address: symbol for symbol, address in TOKENS.items()}
+
+# keccak256("Sync(uint112,uint112)"), emitted by a V2 pair on every reserve change
+SYNC_TOPIC = "0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1"
+
+# Minimal ABIs for locating pairs and reading their reserves
+ROUTER_FACTORY_ABI = [
+    {"inputs": [], "name": "factory", "outputs": [{"internalType": "address", "name": "", "type": "address"}],
+     "stateMutability": "view", "type": "function"}
+]
+FACTORY_ABI = [
+    {"inputs": [{"internalType": "address", "name": "tokenA", "type": "address"},
+                {"internalType": "address", "name": "tokenB", "type": "address"}],
+     "name": "getPair", "outputs": [{"internalType": "address", "name": "pair", "type": "address"}],
+     "stateMutability": "view", "type": "function"}
+]
+PAIR_ABI = [
+    {"inputs": [], "name": "getReserves",
+     "outputs": [{"internalType": "uint112", "name": "reserve0", "type": "uint112"},
+                 {"internalType": "uint112", "name": "reserve1", "type": "uint112"},
+                 {"internalType": "uint32", "name": "blockTimestampLast", "type": "uint32"}],
+     "stateMutability": "view", "type": "function"}
+]
+
+# Number of Sync events to process before the test ends
+MAX_UPDATES = 20
+
+@dataclass(slots=True)
+class Pool:
+    """One router's V2 pair contract for (token_a, token_b), reserves oriented a -> b"""
+    router: str
+    token_a: str
+    token_b: str
+    a_is_token0: bool
+    reserve_a: int
+    reserve_b: int
+
+async def load_pools(monitor, token_pairs):
+    """Find every router's pair contract for each token pair and read its reserves.
+
+    Returns {pair_address (lowercase): Pool}.
+    """
+    w3 = monitor.w3
+    factories = await asyncio.gather(*(
+        w3.eth.contract(address=router, abi=ROUTER_FACTORY_ABI).functions.factory().call()
+        for router in monitor.routers.values()
+    ))
+    
+    keys = [(name, a, b) for a, b in token_pairs for name in monitor.routers]
+    factory_of = dict(zip(monitor.routers, factories))
+    pairs = await asyncio.gather(*(
+        w3.eth.contract(address=factory_of[name], abi=FACTORY_ABI).functions.getPair(a, b).call()
+        for name, a, b in keys
+    ))
+    
+    pools = {}
+    found = [(key, pair) for key, pair in zip(keys, pairs) if int(pair, 16) != 0]
+    reserves = await asyncio.gather(*(
+        w3.eth.contract(address=pair, abi=PAIR_ABI).functions.getReserves().call()
+        for _, pair in found
+    ))
+    for ((name, a, b), pair), (r0, r1, _) in zip(found, reserves):
+        # V2 pairs sort their tokens by address
+        a_is_token0 = int(a, 16) < int(b, 16)
+        r_a, r_b = (r0, r1) if a_is_token0 else (r1, r0)
+        pools[pair.lower()] = Pool(name, a, b, a_is_token0, r_a, r_b)
+    return pools
+
+def print_pair_prices(monitor, pools, token_a, token_b):
+    """Quote one pair on every router from cached reserves; no RPC involved"""
+    decimals = monitor.token_decimals(token_b)
+    prices = {
+        pool.router: v2_quote(QUOTE_AMOUNT_IN, pool.reserve_a, pool.reserve_b) / 10 ** decimals
+        for pool in pools.values() if (pool.token_a, pool.token_b) == (token_a, token_b)
+    }
+    print(f"\n{SYMBOLS[token_a]}/{SYMBOLS[token_b]}: " +
+          ", ".join(f"{name} {price:.6f}" for name, price in prices.items()))
+    
+    uni_price, sushi_price = prices.get('uniswap', 0), prices.get('sushiswap', 0)
+    if uni_price > 0 and sushi_price > 0:
+        # Calculate price difference
+        price_diff = abs(uni_price - sushi_price)
+        price_diff_percent = (price_diff / min(uni_price, sushi_price)) * 100
+        
+        print(f"Price difference: {price_diff_percent:.2f}%")
+        if price_diff_percent > 1.0:  # More than 1% difference
+            print("⚠️ Significant price difference detected!")
 
 async def monitor_prices():
     print("🔍 Starting Price Monitor Test")
@@ -16,6 +109,7 @@ async def monitor_prices():
         contract_address=CONTRACT_ADDRESS,
         private_key=PRIVATE_KEY
     )
+    await monitor.connect()
     
     # Token pairs to monitor
     token_pairs = [
@@ -25,40 +119,43 @@ async def monitor_prices():
     
     print("\n📊 Starting price monitoring...")
     try:
-        # Monitor for 5 rounds
-        for i in range(5):
-            print(f"\nRound {i+1}/5:")
-            print("-" * 30)
+        # Reserves are read once; after that every quote comes from Sync events
+        pools = await load_pools(monitor, token_pairs)
+        for token_a, token_b in token_pairs:
+            print_pair_prices(monitor, pools, token_a, token_b)
+        
+        async with AsyncWeb3.persistent_websocket(WebsocketProviderV2(WS_URL)) as ws_w3:
+            await ws_w3.eth.subscribe("logs", {"address": list(pools), "topics": [SYNC_TOPIC]})
+            print(f"\n⏳ Waiting for Sync events on {len(pools)} pairs...")
             
-            for pair in token_pairs:
-                token_a_symbol = "WETH" if pair[0] == TOKENS["WETH"] else "USDC"
-                token_b_symbol = "USDC" if pair[1] == TOKENS["USDC"] else "USDT"
-                print(f"\nChecking {token_a_symbol}/{token_b_symbol} pair:")
+            updates = 0
+            async for payload in ws_w3.ws.process_subscriptions():
+                log = payload["result"]
+                # A reorg re-sends dropped logs with removed=true; those reserves no longer hold
+                if log.get("removed"):
+                    continue
+                pool = pools.get(log["address"].lower())
+                if pool is None:
+                    continue
                 
-                # Get prices
-                uni_price, sushi_price = await monitor.get_current_prices(pair)
+                r0, r1 = monitor.w3.codec.decode(["uint112", "uint112"], HexBytes(log["data"]))
+                pool.reserve_a, pool.reserve_b = (r0, r1) if pool.a_is_token0 else (r1, r0)
                 
-                # If we got valid prices
-                if uni_price > 0 and sushi_price > 0:
-                    # Calculate price difference
-                    price_diff = abs(uni_price - sushi_price)
-                    price_diff_percent = (price_diff / min(uni_price, sushi_price)) * 100
-                    
-                    print(f"Price difference: {price_diff_percent:.2f}%")
-                    if price_diff_percent > 1.0:  # More than 1% difference
-                        print("⚠️ Significant price difference detected!")
-            
-            # Wait before next round
-            if i < 4:  # Don't wait after last round
-                print("\nWaiting 30 seconds...")
-                await asyncio.sleep(30)
+                updates += 1
+                print(f"\nUpdate {updates}/{MAX_UPDATES}: {pool.router} reserves changed")
+                print_pair_prices(monitor, pools, pool.token_a, pool.token_b)
+                if updates >= MAX_UPDATES:
+                    break
     
     except KeyboardInterrupt:
         print("\n\n🛑 Monitoring stopped by user")
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
+    finally:
+        await monitor.close()
+        monitor.logger.stop()
     
     print("\n✅ Price monitoring test complete")
 
 if __name__ == "__main__":
-    asyncio.run(monitor_prices())
\ No newline at end of file
+    asyncio.run(monitor_prices())
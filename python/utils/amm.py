@@ -0,0 +1,11 @@
+"""
+Constant-product AMM math
+"""
+
+
+def v2_quote(amount_in: int, reserve_in: int, reserve_out: int) -> int:
+    """UniswapV2 getAmountOut (0.3% fee) from pair reserves, in exact integer math"""
+    if reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    n = amount_in * 997
+    return n * reserve_out // (reserve_in * 1000 + n)
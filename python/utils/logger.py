@@ -1,79 +1,145 @@
 """
 Logging utility for the arbitrage bot
 """
+import csv
 import logging
+import logging.handlers
+import queue
 import json
 from datetime import datetime
 import os
-import pandas as pd
+
+# Format strings are built once; records are only formatted on the listener thread
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Shared by every ArbitrageLogger so the listener thread is started only once
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_queue_handler = None
+_listener = None
+
+PRICE_FIELDS = [
+    'timestamp', 'token_pair', 'uniswap_price', 'sushiswap_price',
+    'price_difference', 'price_difference_percent'
+]
 
 class ArbitrageLogger:
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", level=None):
         # Create logs directory if it doesn't exist
         self.log_dir = log_dir
         os.makedirs(log_dir, exist_ok=True)
         
-        # Set up price logging
-        self.price_data = []
-        self.trades_data = []
+        # Level name or number; LOG_LEVEL=DEBUG turns on the debug-only diagnostics
+        self.level = level if level is not None else os.getenv('LOG_LEVEL', 'INFO').upper()
         
         # Set up file handlers
         self.setup_loggers()
     
     def setup_loggers(self):
+        global _queue_handler, _listener
+        
         # Main logger
         self.logger = logging.getLogger('arbitrage_bot')
-        self.logger.setLevel(logging.INFO)
+        self.logger.setLevel(self.level)
+        
+        # Price and trade rows stream straight to the current day's CSV files
+        self._date = None
+        self._price_fp = None
+        self._trade_fp = None
+        self._open_day(datetime.now())
+        
+        if _listener is not None:
+            return
         
         # Create handlers
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Handlers pass everything through; the logger's level does the filtering
         fh = logging.FileHandler(f'{self.log_dir}/bot_{timestamp}.log')
-        fh.setLevel(logging.INFO)
+        sh = logging.StreamHandler()
         
         # Create formatters
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        formatter = logging.Formatter(LOG_FORMAT)
         fh.setFormatter(formatter)
+        sh.setFormatter(formatter)
         
-        # Add handlers
-        self.logger.addHandler(fh)
+        # Callers only enqueue records; a background thread does the blocking writes
+        if _queue_handler is None:
+            _queue_handler = logging.handlers.QueueHandler(_log_queue)
+            logging.getLogger().addHandler(_queue_handler)
+        _listener = logging.handlers.QueueListener(_log_queue, fh, sh, respect_handler_level=True)
+        _listener.start()
+    
+    def _open_day(self, now: datetime):
+        """Switch the CSV writers to now's date, closing the previous day's files"""
+        self._close_csvs()
+        self._date = now.date()
+        date = now.strftime("%Y%m%d")
+        
+        # The header is only written to a new file
+        self._price_fp = self._open_csv(f'{self.log_dir}/price_data_{date}.csv')
+        self._price_writer = csv.DictWriter(self._price_fp, fieldnames=PRICE_FIELDS)
+        if self._price_fp.tell() == 0:
+            self._price_writer.writeheader()
+        
+        # Trade fields come from the caller, so that writer is created on the first trade
+        self._trade_path = f'{self.log_dir}/trade_data_{date}.csv'
+        self._trade_fp = None
+        self._trade_writer = None
+    
+    def _close_csvs(self):
+        """Close whichever CSV files are open"""
+        if self._price_fp is not None:
+            self._price_fp.close()
+            self._price_fp = None
+        if self._trade_fp is not None:
+            self._trade_fp.close()
+            self._trade_fp = None
+    
+    def is_enabled_for(self, level: int) -> bool:
+        """Check a level before building an expensive message"""
+        return self.logger.isEnabledFor(level)
     
     def log_prices(self, token_pair: tuple, uni_price: float, sushi_price: float):
         """Log price data for analysis"""
-        timestamp = datetime.now().isoformat()
+        now = datetime.now()
+        if now.date() != self._date:
+            self._open_day(now)
+        diff = uni_price - sushi_price
+        abs_diff = -diff if diff < 0 else diff
+        lo = uni_price if uni_price < sushi_price else sushi_price
         price_entry = {
-            'timestamp': timestamp,
+            'timestamp': now.isoformat(),
             'token_pair': f"{token_pair[0]}/{token_pair[1]}",
             'uniswap_price': uni_price,
             'sushiswap_price': sushi_price,
-            'price_difference': abs(uni_price - sushi_price),
-            'price_difference_percent': abs(uni_price - sushi_price) / min(uni_price, sushi_price) * 100
+            'price_difference': abs_diff,
+            # A failed quote comes through as 0.0; leave the percentage empty rather than divide by it
+            'price_difference_percent': abs_diff / lo * 100.0 if lo > 0 else ''
         }
-        self.price_data.append(price_entry)
-        
-        # Save to CSV every 100 entries
-        if len(self.price_data) >= 100:
-            self.save_price_data()
+        self._price_writer.writerow(price_entry)
     
     def log_trade(self, trade_data: dict):
         """Log executed trade data"""
-        timestamp = datetime.now().isoformat()
-        trade_data['timestamp'] = timestamp
-        self.trades_data.append(trade_data)
-        self.save_trade_data()
+        now = datetime.now()
+        if now.date() != self._date:
+            self._open_day(now)
+        trade_data['timestamp'] = now.isoformat()
+        if self._trade_writer is None:
+            self._trade_fp = self._open_csv(self._trade_path)
+            self._trade_writer = csv.DictWriter(self._trade_fp, fieldnames=list(trade_data), extrasaction='ignore')
+            if self._trade_fp.tell() == 0:
+                self._trade_writer.writeheader()
+        self._trade_writer.writerow(trade_data)
+        # Trades are rare and worth keeping if the bot dies
+        self._trade_fp.flush()
     
-    def save_price_data(self):
-        """Save price data to CSV"""
-        df = pd.DataFrame(self.price_data)
-        filename = f'{self.log_dir}/price_data_{datetime.now().strftime("%Y%m%d")}.csv'
-        df.to_csv(filename, mode='a', header=not os.path.exists(filename), index=False)
-        self.price_data = []  # Clear after saving
+    @staticmethod
+    def _open_csv(filename: str):
+        """Open a CSV file for appending"""
+        return open(filename, 'a', newline='')
     
-    def save_trade_data(self):
-        """Save trade data to CSV"""
-        df = pd.DataFrame(self.trades_data)
-        filename = f'{self.log_dir}/trade_data_{datetime.now().strftime("%Y%m%d")}.csv'
-        df.to_csv(filename, mode='a', header=not os.path.exists(filename), index=False)
-        self.trades_data = []  # Clear after saving
+    def log_debug(self, message: str):
+        """Log debug message"""
+        self.logger.debug(message)
     
     def log_info(self, message: str):
         """Log informational message"""
@@ -81,4 +147,12 @@ class ArbitrageLogger:
     
     def log_error(self, message: str):
         """Log error message"""
-        self.logger.error(message)
\ No newline at end of file
+        self.logger.error(message)
+    
+    def stop(self):
+        """Flush queued records and CSV files, and stop the listener thread"""
+        global _listener
+        self._close_csvs()
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
@@ -0,0 +1,142 @@
+"""
+RPC connection helpers shared by the bot's Web3 providers
+"""
+import asyncio
+from collections.abc import Mapping
+from typing import Any, List, Optional, Tuple, cast
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web3 import HTTPProvider
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.providers.base import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+# Seconds before an RPC request is abandoned
+RPC_TIMEOUT = 10
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize the web3 types orjson doesn't know, as Web3JsonEncoder would"""
+    if isinstance(obj, (bytes, bytearray)):
+        return '0x' + bytes(obj).hex()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonCodecMixin:
+    """JSON-RPC encode/decode through orjson instead of web3's stdlib json serde"""
+
+    def encode_rpc_request(self, method: RPCEndpoint, params: Any) -> bytes:
+        return orjson.dumps({
+            'jsonrpc': '2.0',
+            'method': method,
+            'params': params or [],
+            'id': next(self.request_counter),
+        }, default=_orjson_default)
+
+    def decode_rpc_response(self, raw_response: bytes) -> RPCResponse:
+        return cast(RPCResponse, orjson.loads(raw_response))
+
+
+class OrjsonHTTPProvider(OrjsonCodecMixin, HTTPProvider):
+    """HTTPProvider with orjson request encoding and response parsing"""
+
+
+class OrjsonJSONProvider(OrjsonCodecMixin, JSONBaseProvider):
+    """Encoder for JSON-RPC requests sent outside of web3's providers"""
+
+
+# Only used to encode requests; its counter gives each sub-request a unique id
+_batch_encoder = OrjsonJSONProvider()
+
+
+def make_request_session() -> requests.Session:
+    """Create a keep-alive session so RPC calls reuse pooled TCP/TLS connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def rpc_batch(session: requests.Session, endpoint_uri: str,
+              calls: List[Tuple[str, list]]) -> List[Any]:
+    """Send several JSON-RPC calls in a single HTTP POST.
+
+    Results are returned in the same order as ``calls``. Raises ValueError if
+    any call comes back with an error, like web3's own providers.
+    """
+    payload = b'[' + b','.join(_batch_encoder.encode_rpc_request(method, params) for method, params in calls) + b']'
+    response = session.post(
+        endpoint_uri,
+        data=payload,
+        headers={'Content-Type': 'application/json'},
+        timeout=RPC_TIMEOUT
+    )
+    response.raise_for_status()
+    
+    # Servers may answer out of order; ids were issued in increasing order
+    results = []
+    for reply in sorted(orjson.loads(response.content), key=lambda r: r['id']):
+        if 'error' in reply:
+            raise ValueError(reply['error'])
+        results.append(reply['result'])
+    return results
+
+
+class AsyncIPCProvider(OrjsonCodecMixin, AsyncJSONBaseProvider):
+    """Async JSON-RPC provider over a local node's Unix domain socket.
+
+    Skips the HTTP framing of AsyncHTTPProvider for co-located nodes. Requests
+    share one socket, so they are serialized with a lock to keep each response
+    paired with its request.
+    """
+
+    def __init__(self, ipc_path: str, timeout: float = RPC_TIMEOUT, read_chunk_size: int = 64 * 1024):
+        super().__init__()
+        self.ipc_path = ipc_path
+        self.timeout = timeout
+        self.read_chunk_size = read_chunk_size
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        # Reused for every response so reads don't reallocate the buffer
+        self._buffer = bytearray()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request = self.encode_rpc_request(method, params)
+        async with self._lock:
+            if self._writer is None or self._writer.is_closing():
+                self._reader, self._writer = await asyncio.open_unix_connection(self.ipc_path)
+            try:
+                self._writer.write(request)
+                await self._writer.drain()
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (asyncio.TimeoutError, ConnectionError):
+                # A half-read response would desync the socket, start over on the next request
+                self._writer.close()
+                self._writer = None
+                raise
+
+    async def _read_response(self) -> RPCResponse:
+        buffer = self._buffer
+        del buffer[:]
+        while True:
+            chunk = await self._reader.read(self.read_chunk_size)
+            if not chunk:
+                raise ConnectionError(f"IPC socket closed: {self.ipc_path}")
+            buffer += chunk
+            # Only try to parse once the payload could be a complete JSON object
+            if buffer.rstrip().endswith(b'}'):
+                try:
+                    return self.decode_rpc_response(buffer)
+                except ValueError:
+                    continue
@@ -1,5 +1,7 @@
 import os
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from web3 import Web3
 
 # Load environment variables
@@ -8,8 +10,10 @@ load_dotenv()
 private_key = os.getenv("PRIVATE_KEY")
 alchemy_rpc = os.getenv("RPC_URL")
 
-# Setup provider
-w3 = Web3(Web3.HTTPProvider(alchemy_rpc))
+# Setup provider on a keep-alive session so every call reuses one TLS connection
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+w3 = Web3(Web3.HTTPProvider(alchemy_rpc, session=session))
 
 # Get account from private key
 account = w3.eth.account.from_key(private_key)
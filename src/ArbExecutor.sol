@@ -4,6 +4,7 @@ pragma solidity ^0.8.20;
 import "@openzeppelin/contracts/utils/ReentrancyGuard.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
 import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/extensions/IERC20Permit.sol";
 import "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
 
 interface IUniswapV2Router {
@@ -300,6 +301,35 @@ contract ArbExecutor is ReentrancyGuard, Ownable {
      * @param amount Amount to deposit
      */
     function depositToken(address token, uint256 amount) external {
+        _deposit(token, amount);
+    }
+
+    /**
+     * @dev Approve via an EIP-2612 permit signature and deposit in one transaction
+     * @param token Address of the token to deposit (must support permit)
+     * @param amount Amount to deposit
+     * @param deadline Timestamp after which the permit signature expires
+     * @param v Signature recovery id
+     * @param r Signature r value
+     * @param s Signature s value
+     */
+    function permitAndDeposit(
+        address token,
+        uint256 amount,
+        uint256 deadline,
+        uint8 v,
+        bytes32 r,
+        bytes32 s
+    ) external {
+        // A front-run permit leaves the allowance in place, so only the transfer has to succeed
+        try IERC20Permit(token).permit(msg.sender, address(this), amount, deadline, v, r, s) {} catch {}
+        _deposit(token, amount);
+    }
+
+    /**
+     * @dev Internal function to pull deposited tokens from the sender
+     */
+    function _deposit(address token, uint256 amount) internal {
         require(authorizedTokens[token], "Token not authorized");
         require(amount > 0, "Amount must be greater than 0");
 
@@ -5,6 +5,8 @@ import {Test} from "forge-std/Test.sol";
 import {console} from "forge-std/console.sol";
 import {ArbExecutor} from "../src/ArbExecutor.sol";
 import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {ERC20Permit} from "@openzeppelin/contracts/token/ERC20/extensions/ERC20Permit.sol";
 import {SafeERC20} from "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
 
 // Mock contracts for testing
@@ -98,6 +100,14 @@ contract MockRouter {
     }
 }
 
+contract MockPermitERC20 is ERC20Permit {
+    constructor(string memory _name, string memory _symbol) ERC20(_name, _symbol) ERC20Permit(_name) {}
+    
+    function mint(address to, uint256 amount) external {
+        _mint(to, amount);
+    }
+}
+
 /**
  * @title ArbExecutorTest
  * @dev Unit tests for contract logic (local fork or dry-run)
@@ -213,6 +223,88 @@ contract ArbExecutorTest is Test {
         assertEq(arbExecutor.getTokenBalance(address(newToken)), 50e18);
     }
     
+    function _signPermit(
+        MockPermitERC20 permitToken,
+        address owner,
+        uint256 ownerKey,
+        uint256 value,
+        uint256 deadline
+    ) internal view returns (uint8 v, bytes32 r, bytes32 s) {
+        bytes32 structHash = keccak256(abi.encode(
+            keccak256("Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)"),
+            owner,
+            address(arbExecutor),
+            value,
+            permitToken.nonces(owner),
+            deadline
+        ));
+        bytes32 digest = keccak256(abi.encodePacked("\x19\x01", permitToken.DOMAIN_SEPARATOR(), structHash));
+        return vm.sign(ownerKey, digest);
+    }
+    
+    function testPermitAndDeposit() public {
+        MockPermitERC20 permitToken = new MockPermitERC20("Permit Token", "PRM");
+        arbExecutor.authorizeToken(address(permitToken));
+        
+        (address permitUser, uint256 permitUserKey) = makeAddrAndKey("permitUser");
+        permitToken.mint(permitUser, 100e18);
+        
+        uint256 deadline = block.timestamp + 1 hours;
+        (uint8 v, bytes32 r, bytes32 s) = _signPermit(permitToken, permitUser, permitUserKey, 50e18, deadline);
+        
+        // No separate approve transaction
+        vm.prank(permitUser);
+        arbExecutor.permitAndDeposit(address(permitToken), 50e18, deadline, v, r, s);
+        
+        assertEq(permitToken.balanceOf(address(arbExecutor)), 50e18);
+        assertEq(arbExecutor.getTokenBalance(address(permitToken)), 50e18);
+        assertEq(permitToken.nonces(permitUser), 1);
+    }
+    
+    function testPermitAndDepositAfterFrontRunPermit() public {
+        MockPermitERC20 permitToken = new MockPermitERC20("Permit Token", "PRM");
+        arbExecutor.authorizeToken(address(permitToken));
+        
+        (address permitUser, uint256 permitUserKey) = makeAddrAndKey("permitUser");
+        permitToken.mint(permitUser, 100e18);
+        
+        uint256 deadline = block.timestamp + 1 hours;
+        (uint8 v, bytes32 r, bytes32 s) = _signPermit(permitToken, permitUser, permitUserKey, 50e18, deadline);
+        
+        // Someone submits the signature straight to the token first
+        vm.prank(makeAddr("frontRunner"));
+        permitToken.permit(permitUser, address(arbExecutor), 50e18, deadline, v, r, s);
+        
+        // The permit inside permitAndDeposit now fails, but the allowance is already set
+        vm.prank(permitUser);
+        arbExecutor.permitAndDeposit(address(permitToken), 50e18, deadline, v, r, s);
+        
+        assertEq(permitToken.balanceOf(address(arbExecutor)), 50e18);
+        assertEq(arbExecutor.getTokenBalance(address(permitToken)), 50e18);
+    }
+    
+    function testPermitAndDepositReusedPermit() public {
+        MockPermitERC20 permitToken = new MockPermitERC20("Permit Token", "PRM");
+        arbExecutor.authorizeToken(address(permitToken));
+        
+        (address permitUser, uint256 permitUserKey) = makeAddrAndKey("permitUser");
+        permitToken.mint(permitUser, 100e18);
+        
+        uint256 deadline = block.timestamp + 1 hours;
+        (uint8 v, bytes32 r, bytes32 s) = _signPermit(permitToken, permitUser, permitUserKey, 50e18, deadline);
+        
+        vm.prank(permitUser);
+        arbExecutor.permitAndDeposit(address(permitToken), 50e18, deadline, v, r, s);
+        
+        // The nonce is spent and the allowance used up, so replaying the signature can't pull more tokens
+        vm.expectRevert();
+        vm.prank(permitUser);
+        arbExecutor.permitAndDeposit(address(permitToken), 50e18, deadline, v, r, s);
+        
+        assertEq(permitToken.balanceOf(address(arbExecutor)), 50e18);
+        assertEq(permitToken.balanceOf(permitUser), 50e18);
+    }
+    
     function testDepositUnauthorizedToken() public {
         MockERC20 unauthorizedToken = new MockERC20("Unauthorized", "UNAUTH", 18);
         